@@ -1,33 +1,1139 @@
-from flask import Flask, render_template_string, request, redirect, url_for
+import time
+
+STARTUP_STARTED = time.perf_counter()
+
+from flask import Flask, request, redirect, url_for, jsonify, send_from_directory
 
 import sqlite3
 import os
+import sys
 import json
+import html as html_lib
+import hashlib
+import zlib
+import queue
+import socket
+import threading
+from urllib.parse import urlencode
+
+# Optional and rarely needed modules (brotli, csv, concurrent.futures, subprocess)
+# are imported where they are used, so they don't slow down startup
 
 app = Flask(__name__)
 
 DB_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'db', 'personal_data.db')
 
+# Startup - time budget for --profile-startup, and whether to run the debug reloader
+STARTUP_BUDGET_MS = int(os.environ.get('JACKTABLE_STARTUP_BUDGET_MS', '250'))
+DEBUG = os.environ.get('JACKTABLE_DEBUG', '1') == '1'
+
+# Write queue settings - set JACKTABLE_WRITE_QUEUE=1 to batch writes into group commits
+WRITE_QUEUE_ENABLED = os.environ.get('JACKTABLE_WRITE_QUEUE', '0') == '1'
+WRITE_QUEUE_FLUSH_MS = int(os.environ.get('JACKTABLE_WRITE_QUEUE_FLUSH_MS', '20'))
+WRITE_QUEUE_BATCH_ROWS = int(os.environ.get('JACKTABLE_WRITE_QUEUE_BATCH_ROWS', '500'))
+WRITE_QUEUE_MAX_PENDING = int(os.environ.get('JACKTABLE_WRITE_QUEUE_MAX_PENDING', '10000'))
+WRITE_QUEUE_TIMEOUT = float(os.environ.get('JACKTABLE_WRITE_QUEUE_TIMEOUT', '5'))
+# FULL fsyncs every commit, NORMAL only at WAL checkpoints, OFF leaves it to the OS
+WRITE_QUEUE_SYNCHRONOUS = os.environ.get('JACKTABLE_WRITE_QUEUE_SYNCHRONOUS', 'FULL').upper()
+# Journal mode the writer switches the database to, e.g. WAL. SQLite stores this in the file
+# itself, so it outlasts the app. Empty leaves the database's own journal mode alone.
+WRITE_QUEUE_JOURNAL_MODE = os.environ.get('JACKTABLE_WRITE_QUEUE_JOURNAL_MODE', '').upper()
+
+# Response compression - responses smaller than this aren't worth compressing
+COMPRESS_MIN_SIZE = int(os.environ.get('JACKTABLE_COMPRESS_MIN_SIZE', '500'))
+COMPRESS_LEVEL = int(os.environ.get('JACKTABLE_COMPRESS_LEVEL', '6'))
+COMPRESS_MIMETYPES = ('text/html', 'text/css', 'text/plain', 'application/javascript', 'application/json')
+
+# Listings only fetch this many characters of long text/blob values; the rest loads on demand
+CELL_PREVIEW_LENGTH = int(os.environ.get('JACKTABLE_CELL_PREVIEW_LENGTH', '200'))
+
+# Background jobs (reindex, vacuum, analyze, import, export)
+JOB_WORKERS = int(os.environ.get('JACKTABLE_JOB_WORKERS', '1'))
+JOB_MAX_QUEUED = int(os.environ.get('JACKTABLE_JOB_MAX_QUEUED', '100'))
+JOB_TIMEOUT = float(os.environ.get('JACKTABLE_JOB_TIMEOUT', '3600'))
+# Pause between batches so interactive requests get the database in between
+JOB_THROTTLE_MS = int(os.environ.get('JACKTABLE_JOB_THROTTLE_MS', '5'))
+JOB_CACHE_KB = int(os.environ.get('JACKTABLE_JOB_CACHE_KB', '8192'))
+JOB_BATCH_ROWS = 1000
+IMPORT_DIR = os.path.join(os.path.dirname(DB_PATH), 'imports')
+EXPORT_DIR = os.path.join(os.path.dirname(DB_PATH), 'exports')
+
+# Small, read-mostly tables to serve from memory, e.g. JACKTABLE_HOT_TABLES=countries,statuses
+HOT_TABLES = [t.strip() for t in os.environ.get('JACKTABLE_HOT_TABLES', '').split(',') if t.strip()]
+HOT_TABLE_MAX_ROWS = int(os.environ.get('JACKTABLE_HOT_TABLE_MAX_ROWS', '10000'))
+# How stale a hot table may get when another program writes while this app is also writing
+HOT_TABLE_RECHECK_SECONDS = float(os.environ.get('JACKTABLE_HOT_TABLE_RECHECK_SECONDS', '5'))
+
+# Duplicate detection - MinHash signatures are MINHASH_BANDS x MINHASH_ROWS values long.
+# 16 bands of 4 make rows around 50% similar likely to share a bucket.
+MINHASH_BANDS = 16
+MINHASH_ROWS = 4
+SHINGLE_SIZE = 4
+NEAR_DUPLICATE_THRESHOLD = float(os.environ.get('JACKTABLE_NEAR_DUPLICATE_THRESHOLD', '0.7'))
+# Tables with more rows than this to (re)hash are indexed by a background job instead
+DEDUPE_INLINE_ROWS = int(os.environ.get('JACKTABLE_DEDUPE_INLINE_ROWS', '2000'))
+# Most candidate pairs compared per near-duplicate search; results say when this cut them short
+DEDUPE_MAX_PAIRS = int(os.environ.get('JACKTABLE_DEDUPE_MAX_PAIRS', '50000'))
+
+# Columns and tables JackTable manages itself - hidden from views and forms
+SYSTEM_COLUMNS = ('_version', '_updated_at', '_row_hash')
+CHANGE_LOG_TABLE = '_jacktable_changes'
+JOBS_TABLE = '_jacktable_jobs'
+DEDUPE_TABLE = '_jacktable_dedupe'
+LSH_TABLE = '_jacktable_lsh'
+NOW_SQL = "strftime('%Y-%m-%dT%H:%M:%fZ', 'now')"
+
+class SchemaCatalog:
+    # Caches table and column lists until PRAGMA schema_version says the schema changed
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = None
+        self.schema_version = None
+        self.table_names = None
+        self.table_columns = {}
+
+    def _check(self):
+        if self.conn is None:
+            self.conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        schema_version = self.conn.execute("PRAGMA schema_version").fetchone()[0]
+        if schema_version != self.schema_version:
+            self.schema_version = schema_version
+            self.table_names = None
+            self.table_columns = {}
+
+    def tables(self):
+        with self.lock:
+            self._check()
+            if self.table_names is None:
+                rows = self.conn.execute("SELECT name FROM sqlite_master WHERE type='table';").fetchall()
+                self.table_names = [row[0] for row in rows]
+            return list(self.table_names)
+
+    def columns(self, table_name):
+        with self.lock:
+            self._check()
+            if table_name not in self.table_columns:
+                rows = self.conn.execute(f"PRAGMA table_info({table_name})").fetchall()
+                self.table_columns[table_name] = [(col[1], col[2]) for col in rows]
+            return list(self.table_columns[table_name])
+
+schema_catalog = SchemaCatalog(DB_PATH)
+
 def get_tables():
+    tables = schema_catalog.tables()
+    return [table for table in tables if not table.startswith(('sqlite_', '_jacktable_'))]
+
+def get_column_info(table_name):
+    columns = schema_catalog.columns(table_name)
+    return [col for col in columns if col[0] not in SYSTEM_COLUMNS]
+
+versioned_tables = set()
+
+def ensure_versioning(table_name):
+    # Adds the row version columns and the shared change log the first time a table is written
+    if table_name in versioned_tables:
+        return
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
-    cursor.execute("SELECT name FROM sqlite_master WHERE type='table';")
-    tables = cursor.fetchall()
+    cursor.execute(f"""
+        CREATE TABLE IF NOT EXISTS {CHANGE_LOG_TABLE} (
+            seq INTEGER PRIMARY KEY AUTOINCREMENT,
+            table_name TEXT NOT NULL,
+            row_id INTEGER NOT NULL,
+            op TEXT NOT NULL,
+            version INTEGER NOT NULL,
+            changes TEXT,
+            changed_at TEXT NOT NULL
+        )
+    """)
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {CHANGE_LOG_TABLE}_table ON {CHANGE_LOG_TABLE} (table_name, seq)")
+    cursor.execute(f"PRAGMA table_info({table_name})")
+    existing = {col[1] for col in cursor.fetchall()}
+    if '_version' not in existing:
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN _version INTEGER NOT NULL DEFAULT 0")
+    if '_updated_at' not in existing:
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN _updated_at TEXT")
+    conn.commit()
     conn.close()
-    return [table[0] for table in tables]
+    hot_tables.note_commit(table_name)
+    versioned_tables.add(table_name)
 
-def get_column_info(table_name):
+class WriteQueueFull(Exception):
+    pass
+
+class WriteRequest:
+    # statements is a list of (sql, params). The first one is the guarded write:
+    # if it touches no rows the rest (change log bookkeeping) are skipped.
+    def __init__(self, statements, table_name=None):
+        self.statements = statements
+        self.table_name = table_name
+        self.done = threading.Event()
+        self.error = None
+        self.lastrowid = None
+        self.rowcount = None
+
+    def wait(self, timeout=None):
+        if not self.done.wait(timeout):
+            raise TimeoutError('Write was not committed in time')
+        if self.error is not None:
+            raise self.error
+        return self
+
+    def apply(self, cursor):
+        for i, (sql, params) in enumerate(self.statements):
+            cursor.execute(sql, params)
+            if i == 0:
+                self.lastrowid = cursor.lastrowid
+                self.rowcount = cursor.rowcount
+                if self.rowcount == 0:
+                    break
+
+class WriteQueue:
+    """Funnels writes through a single connection and commits them in batches.
+
+    A write is acknowledged only after the transaction holding it has been
+    committed, so callers waiting on it get the same durability as a direct
+    commit while sharing one fsync with everything else in the batch.
+    """
+
+    def __init__(self, db_path, flush_ms=20, batch_rows=500, max_pending=10000, synchronous='FULL', journal_mode=''):
+        self.db_path = db_path
+        self.flush_interval = flush_ms / 1000.0
+        self.batch_rows = batch_rows
+        self.synchronous = synchronous if synchronous in ('OFF', 'NORMAL', 'FULL', 'EXTRA') else 'FULL'
+        self.journal_mode = journal_mode if journal_mode in ('DELETE', 'TRUNCATE', 'PERSIST', 'WAL') else None
+        self.pending = queue.Queue(maxsize=max_pending)
+        self.lock = threading.Lock()
+        self.thread = None
+
+    def start(self):
+        with self.lock:
+            if self.thread is None or not self.thread.is_alive():
+                self.thread = threading.Thread(target=self._run, name='jacktable-writer', daemon=True)
+                self.thread.start()
+
+    def submit(self, statements, timeout=None, table_name=None):
+        self.start()
+        write = WriteRequest(statements, table_name)
+        try:
+            # Blocks while the queue is full, which pushes back on fast producers
+            self.pending.put(write, timeout=timeout)
+        except queue.Full:
+            raise WriteQueueFull('Write queue is full, try again later')
+        return write
+
+    def _next_batch(self):
+        batch = [self.pending.get()]
+        deadline = time.monotonic() + self.flush_interval
+        while len(batch) < self.batch_rows:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(self.pending.get(timeout=remaining))
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        conn = sqlite3.connect(self.db_path, isolation_level=None, check_same_thread=False)
+        if self.journal_mode:
+            conn.execute(f"PRAGMA journal_mode={self.journal_mode}")
+        conn.execute(f"PRAGMA synchronous={self.synchronous}")
+        cursor = conn.cursor()
+        while True:
+            batch = self._next_batch()
+            try:
+                cursor.execute("BEGIN IMMEDIATE")
+                for write in batch:
+                    # A savepoint per write keeps one bad statement from failing the whole batch.
+                    # Anything can be raised here, e.g. OverflowError for an integer sqlite3 can't bind.
+                    cursor.execute("SAVEPOINT write_request")
+                    try:
+                        write.apply(cursor)
+                        cursor.execute("RELEASE write_request")
+                    except Exception as e:
+                        write.error = e
+                        cursor.execute("ROLLBACK TO write_request")
+                        cursor.execute("RELEASE write_request")
+                cursor.execute("COMMIT")
+                for table_name in {write.table_name for write in batch}:
+                    hot_tables.note_commit(table_name)
+            except Exception as e:
+                for write in batch:
+                    if write.error is None:
+                        write.error = e
+            finally:
+                # Never leave the writer holding the lock, and never leave a caller waiting
+                if conn.in_transaction:
+                    conn.execute("ROLLBACK")
+                for write in batch:
+                    write.done.set()
+
+    def stats(self):
+        return {
+            'pending': self.pending.qsize(),
+            'max_pending': self.pending.maxsize,
+            'flush_ms': int(self.flush_interval * 1000),
+            'batch_rows': self.batch_rows,
+            'synchronous': self.synchronous,
+            'journal_mode': self.journal_mode,
+            'running': self.thread is not None and self.thread.is_alive(),
+        }
+
+write_queue = WriteQueue(
+    DB_PATH,
+    flush_ms=WRITE_QUEUE_FLUSH_MS,
+    batch_rows=WRITE_QUEUE_BATCH_ROWS,
+    max_pending=WRITE_QUEUE_MAX_PENDING,
+    synchronous=WRITE_QUEUE_SYNCHRONOUS,
+    journal_mode=WRITE_QUEUE_JOURNAL_MODE
+)
+
+def execute_write(statements, wait=True, table_name=None):
+    # Route writes through the batching queue when enabled, otherwise commit directly.
+    # table_name is the table being written, so its hot table copy can be refreshed.
+    # A queued write that isn't committed within WRITE_QUEUE_TIMEOUT raises TimeoutError,
+    # but stays queued and will still be committed.
+    if WRITE_QUEUE_ENABLED:
+        write = write_queue.submit(statements, timeout=WRITE_QUEUE_TIMEOUT, table_name=table_name)
+        return write.wait(WRITE_QUEUE_TIMEOUT) if wait else write
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
-    cursor.execute(f"PRAGMA table_info({table_name})")
-    columns = cursor.fetchall()
+    write = WriteRequest(statements, table_name)
+    try:
+        write.apply(cursor)
+        conn.commit()
+        hot_tables.note_commit(table_name)
+    except Exception as e:
+        write.error = e
+    finally:
+        conn.close()
+    write.done.set()
+    return write.wait() if wait else write
+
+def build_write(table_name, op, values=None, row_id=None, version=None):
+    # Returns the statements for one versioned write plus its change log entry.
+    # Passing version makes updates and deletes conditional on the row still being at it.
+    if op not in ('insert', 'update', 'delete'):
+        raise ValueError(f'Unknown operation: {op}')
+    if values is not None and not isinstance(values, dict):
+        raise ValueError('values must be an object')
+    ensure_versioning(table_name)
+    columns = [col[0] for col in get_column_info(table_name)]
+    values = {k: v for k, v in (values or {}).items() if k in columns}
+    log_sql = f"INSERT INTO {CHANGE_LOG_TABLE} (table_name, row_id, op, version, changes, changed_at) "
+    if op == 'insert':
+        if not values:
+            raise ValueError('No known columns in values')
+        names = list(values)
+        placeholders = ", ".join(["?" for _ in names])
+        return [
+            (f"INSERT INTO {table_name} ({', '.join(names)}, _version, _updated_at) VALUES ({placeholders}, 1, {NOW_SQL})",
+             [values[n] for n in names]),
+            (log_sql + f"SELECT ?, last_insert_rowid(), 'insert', 1, ?, {NOW_SQL}",
+             [table_name, json.dumps(values, default=str)]),
+        ]
+    if row_id is None:
+        raise ValueError(f'{op} requires an id')
+    where = "id = ?"
+    where_params = [row_id]
+    if version is not None:
+        where += " AND _version = ?"
+        where_params.append(version)
+    if op == 'update':
+        if not values:
+            raise ValueError('No known columns in values')
+        set_clause = ", ".join([f"{name} = ?" for name in values])
+        if '_row_hash' in [col[0] for col in schema_catalog.columns(table_name)]:
+            # Changed rows get rehashed the next time duplicates are looked for
+            set_clause += ", _row_hash = NULL"
+        new_id = values.get('id', row_id)
+        return [
+            (f"UPDATE {table_name} SET {set_clause}, _version = _version + 1, _updated_at = {NOW_SQL} WHERE {where}",
+             list(values.values()) + where_params),
+            (log_sql + f"SELECT ?, id, 'update', _version, ?, _updated_at FROM {table_name} WHERE id = ?",
+             [table_name, json.dumps(values, default=str), new_id]),
+        ]
+    # Log first so the entry can carry the row's final version, then remove it
+    return [
+        (log_sql + f"SELECT ?, id, 'delete', _version + 1, NULL, {NOW_SQL} FROM {table_name} WHERE {where}",
+         [table_name] + where_params),
+        (f"DELETE FROM {table_name} WHERE id = ?", [row_id]),
+    ]
+
+class JobQueueFull(Exception):
+    pass
+
+class JobCancelled(Exception):
+    pass
+
+class Job:
+    # Handed to job functions: params in, progress out, and check() to honour cancellation
+    def __init__(self, runner, job_id, kind, params):
+        self.runner = runner
+        self.id = job_id
+        self.kind = kind
+        self.params = params
+        self.cancel_event = threading.Event()
+        self.deadline = None
+        self.timed_out = False
+        self.last_report = 0
+
+    def should_stop(self):
+        if self.deadline is not None and time.monotonic() > self.deadline:
+            self.timed_out = True
+        return self.timed_out or self.cancel_event.is_set()
+
+    def check(self):
+        if self.should_stop():
+            raise JobCancelled('Timed out' if self.timed_out else 'Cancelled')
+
+    def pause(self):
+        # Called between batches - yields the database to interactive requests
+        time.sleep(JOB_THROTTLE_MS / 1000.0)
+        self.check()
+
+    def progress(self, fraction, message=None):
+        # Progress goes to the jobs table, but at most a couple of times a second
+        now = time.monotonic()
+        if now - self.last_report >= 0.5 or fraction >= 1:
+            self.last_report = now
+            self.runner.update(self.id, progress=min(fraction, 1.0), message=message)
+
+    def connect(self):
+        conn = sqlite3.connect(self.runner.db_path, timeout=30, isolation_level=None)
+        conn.execute(f"PRAGMA cache_size=-{JOB_CACHE_KB}")
+        # Lets cancellation and the time limit interrupt long single statements like VACUUM
+        conn.set_progress_handler(lambda: 1 if self.should_stop() else 0, 10000)
+        return conn
+
+class JobRunner:
+    """Runs long operations on a small worker pool, off the request path.
+
+    Jobs are recorded in a table so their status survives restarts: jobs that
+    were running when the app stopped are marked failed, queued ones run again.
+    """
+
+    def __init__(self, db_path, workers=1, max_queued=100):
+        self.db_path = db_path
+        self.workers = workers
+        self.max_queued = max_queued
+        self.jobs = {}
+        self.lock = threading.Lock()
+        self.executor = None
+
+    def start(self):
+        with self.lock:
+            if self.executor is not None:
+                return
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute(f"""
+                CREATE TABLE IF NOT EXISTS {JOBS_TABLE} (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    kind TEXT NOT NULL,
+                    params TEXT,
+                    status TEXT NOT NULL,
+                    progress REAL NOT NULL DEFAULT 0,
+                    message TEXT,
+                    result TEXT,
+                    created_at TEXT NOT NULL,
+                    started_at TEXT,
+                    finished_at TEXT
+                )
+            """)
+            cursor.execute(f"UPDATE {JOBS_TABLE} SET status = 'failed', message = 'Interrupted by restart', "
+                           f"finished_at = {NOW_SQL} WHERE status = 'running'")
+            cursor.execute(f"SELECT id, kind, params FROM {JOBS_TABLE} WHERE status = 'queued' ORDER BY id")
+            queued = cursor.fetchall()
+            conn.commit()
+            conn.close()
+            hot_tables.note_commit()
+            from concurrent.futures import ThreadPoolExecutor
+            self.executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix='jacktable-job')
+        for job_id, kind, params in queued:
+            self._schedule(job_id, kind, json.loads(params or '{}'))
+
+    def submit(self, kind, params=None):
+        if kind not in JOB_HANDLERS:
+            raise ValueError(f'Unknown job kind: {kind}')
+        self.start()
+        with self.lock:
+            if len(self.jobs) >= self.max_queued:
+                raise JobQueueFull('Too many jobs queued, try again later')
+            conn = sqlite3.connect(self.db_path)
+            cursor = conn.cursor()
+            cursor.execute(f"INSERT INTO {JOBS_TABLE} (kind, params, status, created_at) VALUES (?, ?, 'queued', {NOW_SQL})",
+                           (kind, json.dumps(params or {})))
+            job_id = cursor.lastrowid
+            conn.commit()
+            conn.close()
+            hot_tables.note_commit()
+        self._schedule(job_id, kind, params or {})
+        return job_id
+
+    def _schedule(self, job_id, kind, params):
+        job = Job(self, job_id, kind, params)
+        with self.lock:
+            self.jobs[job_id] = job
+        self.executor.submit(self._run, job)
+
+    def _run(self, job):
+        try:
+            try:
+                if job.cancel_event.is_set():
+                    self.update(job.id, status='cancelled', finished=True)
+                    return
+                # Inside the try, so a job that can't even be marked running ends up failed, not queued
+                self.update(job.id, status='running', started=True)
+                job.deadline = time.monotonic() + JOB_TIMEOUT
+                result = JOB_HANDLERS[job.kind](job)
+                self.update(job.id, status='done', progress=1.0, result=result, finished=True)
+            except Exception as e:
+                if job.timed_out:
+                    self.update(job.id, status='failed', message='Timed out', finished=True)
+                elif job.cancel_event.is_set():
+                    self.update(job.id, status='cancelled', message='Cancelled', finished=True)
+                else:
+                    self.update(job.id, status='failed', message=str(e), finished=True)
+        finally:
+            with self.lock:
+                self.jobs.pop(job.id, None)
+
+    def cancel(self, job_id):
+        with self.lock:
+            job = self.jobs.get(job_id)
+        if job is None:
+            return False
+        job.cancel_event.set()
+        return True
+
+    def update(self, job_id, status=None, progress=None, message=None, result=None, started=False, finished=False):
+        assignments = []
+        params = []
+        for column, value in (('status', status), ('progress', progress), ('message', message)):
+            if value is not None:
+                assignments.append(f"{column} = ?")
+                params.append(value)
+        if result is not None:
+            assignments.append("result = ?")
+            params.append(json.dumps(result))
+        if started:
+            assignments.append(f"started_at = {NOW_SQL}")
+        if finished:
+            assignments.append(f"finished_at = {NOW_SQL}")
+        conn = sqlite3.connect(self.db_path, timeout=30)
+        conn.execute(f"UPDATE {JOBS_TABLE} SET {', '.join(assignments)} WHERE id = ?", params + [job_id])
+        conn.commit()
+        conn.close()
+        hot_tables.note_commit()
+
+    def list(self, job_id=None, limit=50):
+        self.start()
+        conn = sqlite3.connect(self.db_path)
+        cursor = conn.cursor()
+        query = f"SELECT id, kind, params, status, progress, message, result, created_at, started_at, finished_at FROM {JOBS_TABLE}"
+        if job_id is not None:
+            cursor.execute(query + " WHERE id = ?", (job_id,))
+        else:
+            cursor.execute(query + " ORDER BY id DESC LIMIT ?", (limit,))
+        rows = cursor.fetchall()
+        conn.close()
+        return [{
+            'id': row[0],
+            'kind': row[1],
+            'params': json.loads(row[2] or '{}'),
+            'status': row[3],
+            'progress': row[4],
+            'message': row[5],
+            'result': json.loads(row[6]) if row[6] else None,
+            'created_at': row[7],
+            'started_at': row[8],
+            'finished_at': row[9]
+        } for row in rows]
+
+def job_tables(job):
+    tables = get_tables()
+    table_name = job.params.get('table')
+    if table_name is None:
+        return tables
+    if table_name not in tables:
+        raise ValueError(f'Unknown table: {table_name}')
+    return [table_name]
+
+def run_reindex(job):
+    tables = job_tables(job)
+    conn = job.connect()
+    for i, table_name in enumerate(tables):
+        job.check()
+        conn.execute(f"REINDEX {table_name}")
+        hot_tables.note_commit()
+        job.progress((i + 1) / len(tables), f'Reindexed {table_name}')
+        job.pause()
     conn.close()
-    return [(col[1], col[2]) for col in columns]
+    return {'tables': tables}
 
-def get_table_data(table_name):
+def run_vacuum(job):
+    conn = job.connect()
+    job.progress(0, 'Vacuuming')
+    conn.execute("VACUUM")
+    hot_tables.note_commit()
+    conn.close()
+    return {}
+
+def run_analyze(job):
+    tables = job_tables(job)
+    conn = job.connect()
+    for i, table_name in enumerate(tables):
+        job.check()
+        conn.execute(f"ANALYZE {table_name}")
+        hot_tables.note_commit()
+        job.progress((i + 1) / len(tables), f'Analyzed {table_name}')
+        job.pause()
+    conn.close()
+    return {'tables': tables}
+
+def run_export(job):
+    table_name = job_tables(job)[0] if job.params.get('table') else None
+    if table_name is None:
+        raise ValueError('export requires a table')
+    import csv
+    column_names = [col[0] for col in get_column_info(table_name)]
+    os.makedirs(EXPORT_DIR, exist_ok=True)
+    filename = f'{table_name}-{job.id}.csv'
+    
+    conn = job.connect()
+    total = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0]
+    exported = 0
+    last_rowid = None
+    with open(os.path.join(EXPORT_DIR, filename), 'w', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(column_names)
+        while True:
+            # Page by rowid rather than holding one cursor open, so writers aren't locked out between batches
+            query = f"SELECT rowid, {', '.join(column_names)} FROM {table_name}"
+            if last_rowid is None:
+                rows = conn.execute(query + " ORDER BY rowid LIMIT ?", (JOB_BATCH_ROWS,)).fetchall()
+            else:
+                rows = conn.execute(query + " WHERE rowid > ? ORDER BY rowid LIMIT ?", (last_rowid, JOB_BATCH_ROWS)).fetchall()
+            if not rows:
+                break
+            last_rowid = rows[-1][0]
+            writer.writerows(row[1:] for row in rows)
+            exported += len(rows)
+            job.progress(exported / total if total else 1, f'{exported} of {total} rows')
+            job.pause()
+    conn.close()
+    return {'file': filename, 'rows': exported}
+
+def run_import(job):
+    if not job.params.get('table') or not job.params.get('file'):
+        raise ValueError('import requires a table and a file')
+    import csv
+    table_name = job_tables(job)[0]
+    # Only files dropped into the imports folder can be imported
+    path = os.path.join(IMPORT_DIR, os.path.basename(job.params['file']))
+    with open(path, newline='') as f:
+        total = max(sum(1 for _ in f) - 1, 0)
+    
+    # Set up versioning before the batches take the write lock, build_write would block on it
+    ensure_versioning(table_name)
+    conn = job.connect()
+    cursor = conn.cursor()
+    imported = 0
+    with open(path, newline='') as f:
+        reader = csv.DictReader(f)
+        batch = []
+        for row in reader:
+            batch.append(row)
+            if len(batch) >= JOB_BATCH_ROWS:
+                imported += import_batch(cursor, table_name, batch)
+                batch = []
+                job.progress(imported / total if total else 1, f'{imported} of {total} rows')
+                job.pause()
+        if batch:
+            imported += import_batch(cursor, table_name, batch)
+    job.progress(1, f'{imported} of {total} rows')
+    conn.close()
+    return {'table': table_name, 'rows': imported}
+
+def import_batch(cursor, table_name, rows):
+    # Each batch is its own transaction, so cancelling keeps what was already imported
+    apply_in_transaction(cursor, [build_write(table_name, 'insert', row) for row in rows], table_name)
+    return len(rows)
+
+def apply_in_transaction(cursor, writes, table_name=None):
+    # Applies several build_write() results all-or-nothing on a connection opened with isolation_level=None
+    cursor.execute("BEGIN IMMEDIATE")
+    try:
+        results = [WriteRequest(statements, table_name) for statements in writes]
+        for write in results:
+            write.apply(cursor)
+        cursor.execute("COMMIT")
+        hot_tables.note_commit(table_name)
+    except Exception:
+        cursor.execute("ROLLBACK")
+        raise
+    return results
+
+MINHASH_PRIME = (1 << 61) - 1
+def hash64(text):
+    return int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), 'big', signed=True)
+
+# Fixed (not random) so stored LSH buckets stay valid across restarts
+MINHASH_PARAMS = [(hash64(f'a{i}') % (MINHASH_PRIME - 1) + 1, hash64(f'b{i}') % MINHASH_PRIME)
+                  for i in range(MINHASH_BANDS * MINHASH_ROWS)]
+
+def normalize_value(value, column_type):
+    # Makes values that only differ in case, spacing or number formatting compare equal
+    if value is None:
+        return ''
+    if not is_large_type(column_type):
+        try:
+            number = float(value)
+            return repr(int(number)) if number.is_integer() else repr(number)
+        except (TypeError, ValueError, OverflowError):
+            pass
+    if isinstance(value, bytes):
+        return value.hex()
+    return ' '.join(str(value).casefold().split())
+
+def shingles(text):
+    if len(text) <= SHINGLE_SIZE:
+        return {text} if text else set()
+    return {text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1)}
+
+def minhash_buckets(shingle_set):
+    # One LSH bucket per band; rows sharing any bucket are near-duplicate candidates
+    hashes = [hash64(shingle) & 0xFFFFFFFFFFFFFFFF for shingle in shingle_set]
+    signature = [min((a * h + b) % MINHASH_PRIME for h in hashes) for a, b in MINHASH_PARAMS]
+    return [hash64(f'{band}:{signature[band * MINHASH_ROWS:(band + 1) * MINHASH_ROWS]}')
+            for band in range(MINHASH_BANDS)]
+
+class DedupeNotIndexed(Exception):
+    pass
+
+def ensure_dedupe(table_name):
+    # Sets up the hash column and LSH buckets. Only called from POSTs and jobs, as it alters the table.
+    ensure_versioning(table_name)
+    conn = sqlite3.connect(DB_PATH, timeout=30)
+    cursor = conn.cursor()
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {DEDUPE_TABLE} (table_name TEXT PRIMARY KEY, columns TEXT NOT NULL)")
+    cursor.execute(f"CREATE TABLE IF NOT EXISTS {LSH_TABLE} (table_name TEXT NOT NULL, row_id INTEGER NOT NULL, bucket INTEGER NOT NULL)")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {LSH_TABLE}_bucket ON {LSH_TABLE} (table_name, bucket)")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {LSH_TABLE}_row ON {LSH_TABLE} (table_name, row_id)")
+    if '_row_hash' not in [col[0] for col in schema_catalog.columns(table_name)]:
+        cursor.execute(f"ALTER TABLE {table_name} ADD COLUMN _row_hash INTEGER")
+    cursor.execute(f"CREATE INDEX IF NOT EXISTS {table_name}__row_hash ON {table_name} (_row_hash)")
+    conn.commit()
+    conn.close()
+    hot_tables.note_commit()
+
+def indexed_columns(cursor, table_name):
+    # The columns the table's row hashes were computed over, or None if it was never indexed
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name = ?", (DEDUPE_TABLE,))
+    if cursor.fetchone() is None:
+        return None
+    cursor.execute(f"SELECT columns FROM {DEDUPE_TABLE} WHERE table_name = ?", (table_name,))
+    row = cursor.fetchone()
+    return json.loads(row[0]) if row else None
+
+def use_dedupe_columns(conn, table_name, columns):
+    # Points the row hashes at a new set of columns. Clears every hash in one
+    # full-table write, so it runs in the indexing job unless the table is small.
+    cursor = conn.cursor()
+    cursor.execute("BEGIN IMMEDIATE")
+    if indexed_columns(cursor, table_name) != columns:
+        cursor.execute(f"INSERT OR REPLACE INTO {DEDUPE_TABLE} (table_name, columns) VALUES (?, ?)",
+                       (table_name, json.dumps(columns)))
+        cursor.execute(f"UPDATE {table_name} SET _row_hash = NULL")
+        cursor.execute(f"DELETE FROM {LSH_TABLE} WHERE table_name = ?", (table_name,))
+    cursor.execute("COMMIT")
+    hot_tables.note_commit()
+
+def refresh_row_hashes(table_name, columns, job=None):
+    # Hashes rows that are new or changed since the last run (their _row_hash is NULL).
+    # Returns the number of rows hashed, or None if the table was indexed on other
+    # columns in the meantime - hashing on with these would mix the two up.
+    types = dict(get_column_info(table_name))
+    text_columns = [col for col in columns if is_large_type(types[col])]
+    conn = job.connect() if job else sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    cursor = conn.cursor()
+    # Buckets of rows deleted since the last run
+    cursor.execute(f"DELETE FROM {LSH_TABLE} WHERE table_name = ? AND row_id NOT IN (SELECT id FROM {table_name})",
+                   (table_name,))
+    hot_tables.note_commit()
+    total = cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE _row_hash IS NULL").fetchone()[0]
+    done = 0
+    while True:
+        cursor.execute(f"SELECT id, {', '.join(columns)} FROM {table_name} WHERE _row_hash IS NULL LIMIT ?",
+                       (JOB_BATCH_ROWS,))
+        rows = cursor.fetchall()
+        if not rows:
+            break
+        cursor.execute("BEGIN IMMEDIATE")
+        if indexed_columns(cursor, table_name) != columns:
+            cursor.execute("ROLLBACK")
+            conn.close()
+            return None
+        for row in rows:
+            values = [normalize_value(value, types[col]) for col, value in zip(columns, row[1:])]
+            cursor.execute(f"UPDATE {table_name} SET _row_hash = ? WHERE id = ?", (hash64('\x1f'.join(values)), row[0]))
+            cursor.execute(f"DELETE FROM {LSH_TABLE} WHERE table_name = ? AND row_id = ?", (table_name, row[0]))
+            if text_columns:
+                text = ' '.join(values[columns.index(col)] for col in text_columns)
+                shingle_set = shingles(text)
+                if shingle_set:
+                    cursor.executemany(f"INSERT INTO {LSH_TABLE} (table_name, row_id, bucket) VALUES (?, ?, ?)",
+                                       [(table_name, row[0], bucket) for bucket in minhash_buckets(shingle_set)])
+        cursor.execute("COMMIT")
+        hot_tables.note_commit()
+        done += len(rows)
+        if job:
+            job.progress(done / total if total else 1, f'Hashed {done} of {total} rows')
+            job.pause()
+    conn.close()
+    return done
+
+def run_dedupe_index(job):
+    table_name = job_tables(job)[0] if job.params.get('table') else None
+    if table_name is None:
+        raise ValueError('dedupe_index requires a table')
+    columns = job.params.get('columns')
+    known = [col[0] for col in get_column_info(table_name)]
+    if not columns or any(col not in known for col in columns):
+        raise ValueError('dedupe_index requires columns of the table')
+    ensure_dedupe(table_name)
+    conn = job.connect()
+    use_dedupe_columns(conn, table_name, columns)
+    conn.close()
+    rows = refresh_row_hashes(table_name, columns, job)
+    if rows is None:
+        raise JobCancelled('Superseded by an index of other columns')
+    return {'table': table_name, 'columns': columns, 'rows': rows}
+
+def find_duplicates(table_name, columns, near=False, threshold=NEAR_DUPLICATE_THRESHOLD, limit=500):
+    """Returns (groups, truncated): groups of duplicate row ids over the given columns, lowest id first.
+
+    Exact duplicates share a row hash. With near=True, rows whose text columns
+    land in the same LSH bucket are compared on their shingles and grouped
+    when their Jaccard similarity reaches the threshold. Only one row per hash
+    takes part in that comparison, so piles of identical rows don't turn into
+    a quadratic number of pairs. truncated is True when limit or
+    DEDUPE_MAX_PAIRS cut the search short.
+    """
+    types = dict(get_column_info(table_name))
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
+    # One read transaction, so the hashes can't be switched to other columns halfway through
+    cursor.execute("BEGIN")
+    if indexed_columns(cursor, table_name) != columns:
+        conn.close()
+        raise DedupeNotIndexed(f'{table_name} is not indexed on these columns')
+    cursor.execute(f"""
+        SELECT group_concat(id) FROM (SELECT id, _row_hash FROM {table_name} WHERE _row_hash IS NOT NULL ORDER BY id)
+        GROUP BY _row_hash HAVING COUNT(*) > 1 LIMIT ?
+    """, (limit + 1,))
+    groups = [sorted(int(i) for i in row[0].split(',')) for row in cursor.fetchall()]
+    truncated = len(groups) > limit
+    if not near:
+        conn.close()
+        return groups[:limit], truncated
+    
+    text_columns = [col for col in columns if is_large_type(types[col])]
+    cursor.execute(f"""
+        WITH representatives AS (
+            SELECT MIN(id) AS id FROM {table_name} WHERE _row_hash IS NOT NULL GROUP BY _row_hash
+        )
+        SELECT DISTINCT a.row_id, b.row_id FROM {LSH_TABLE} a
+        JOIN representatives ra ON ra.id = a.row_id
+        JOIN {LSH_TABLE} b ON b.table_name = a.table_name AND b.bucket = a.bucket AND b.row_id > a.row_id
+        JOIN representatives rb ON rb.id = b.row_id
+        WHERE a.table_name = ? LIMIT ?
+    """, (table_name, DEDUPE_MAX_PAIRS + 1))
+    pairs = cursor.fetchall()
+    if len(pairs) > DEDUPE_MAX_PAIRS:
+        pairs = pairs[:DEDUPE_MAX_PAIRS]
+        truncated = True
+    ids = sorted({row_id for pair in pairs for row_id in pair})
+    shingle_sets = {}
+    for start in range(0, len(ids), 500):
+        chunk = ids[start:start + 500]
+        cursor.execute(f"SELECT id, {', '.join(text_columns)} FROM {table_name} "
+                       f"WHERE id IN ({', '.join(['?'] * len(chunk))})", chunk)
+        for row in cursor.fetchall():
+            shingle_sets[row[0]] = shingles(' '.join(normalize_value(v, types[c]) for c, v in zip(text_columns, row[1:])))
+    conn.close()
     
+    # Union-find over verified pairs, on top of the exact groups
+    parent = {}
+    def find(x):
+        while parent.setdefault(x, x) != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    for group in groups:
+        for row_id in group[1:]:
+            parent[find(row_id)] = find(group[0])
+    for a, b in pairs:
+        if a not in shingle_sets or b not in shingle_sets:
+            continue
+        union = len(shingle_sets[a] | shingle_sets[b])
+        if union and len(shingle_sets[a] & shingle_sets[b]) / union >= threshold:
+            parent[find(b)] = find(a)
+    clusters = {}
+    for row_id in list(parent):
+        clusters.setdefault(find(row_id), []).append(row_id)
+    groups = sorted((sorted(group) for group in clusters.values() if len(group) > 1), key=lambda g: g[0])
+    return groups[:limit], truncated or len(groups) > limit
+
+def resolve_duplicates(table_name, groups, action):
+    # Keeps the first (lowest id) row of each group and deletes the rest, in one transaction.
+    # merge first fills the kept row's empty fields from the rows being removed.
+    column_names = [col[0] for col in get_column_info(table_name)]
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    cursor = conn.cursor()
+    writes = []
+    deletes = []
+    for ids in groups:
+        keeper, duplicates = ids[0], ids[1:]
+        if not duplicates:
+            continue
+        if action == 'merge':
+            cursor.execute(f"SELECT id, {', '.join(column_names)} FROM {table_name} "
+                           f"WHERE id IN ({', '.join(['?'] * len(ids))}) ORDER BY id", ids)
+            rows = {row[0]: row[1:] for row in cursor.fetchall()}
+            if keeper not in rows:
+                continue
+            fill = {}
+            for i, col in enumerate(column_names):
+                if rows[keeper][i] not in (None, ''):
+                    continue
+                for row_id in duplicates:
+                    if row_id in rows and rows[row_id][i] not in (None, ''):
+                        fill[col] = rows[row_id][i]
+                        break
+            if fill:
+                writes.append(build_write(table_name, 'update', fill, keeper))
+        for row_id in duplicates:
+            deletes.append(len(writes))
+            writes.append(build_write(table_name, 'delete', row_id=row_id))
+    results = apply_in_transaction(cursor, writes, table_name)
+    conn.close()
+    return sum(1 for i in deletes if results[i].rowcount)
+
+def dedupe_job(table_name, columns, cancel_others=False):
+    # The running indexing job for these columns, if any
+    found = None
+    for job in list(job_runner.jobs.values()):
+        if job.kind != 'dedupe_index' or job.params.get('table') != table_name or job.cancel_event.is_set():
+            continue
+        if job.params.get('columns') == columns:
+            found = job.id
+        elif cancel_others:
+            # Its hashes would only be thrown away
+            job_runner.cancel(job.id)
+    return found
+
+def check_dedupe_columns(table_name, columns):
+    known = [col[0] for col in get_column_info(table_name)]
+    if not columns or any(col not in known for col in columns):
+        raise ValueError('Choose one or more columns of the table')
+
+def index_duplicates(table_name, columns):
+    # Indexes the table on these columns: inline when it is small, otherwise in a
+    # background job. Returns the job id, or None when the index is ready.
+    check_dedupe_columns(table_name, columns)
+    job_id = dedupe_job(table_name, columns, cancel_others=True)
+    if job_id is not None:
+        return job_id
+    ensure_dedupe(table_name)
+    conn = sqlite3.connect(DB_PATH, timeout=30, isolation_level=None)
+    indexed = indexed_columns(conn.cursor(), table_name) == columns
+    query = f"SELECT COUNT(*) FROM {table_name}" + (" WHERE _row_hash IS NULL" if indexed else "")
+    if conn.execute(query).fetchone()[0] > DEDUPE_INLINE_ROWS:
+        conn.close()
+        return job_runner.submit('dedupe_index', {'table': table_name, 'columns': columns})
+    if not indexed:
+        use_dedupe_columns(conn, table_name, columns)
+    conn.close()
+    refresh_row_hashes(table_name, columns)
+    return None
+
+def prepare_duplicates(table_name, columns, near=False, threshold=NEAR_DUPLICATE_THRESHOLD):
+    # Looks for duplicates without touching the schema, hashing the few rows changed since
+    # the last index inline. Returns (groups, id of the indexing job or None, whether the
+    # results were cut short). Raises DedupeNotIndexed when index_duplicates() is needed first.
+    check_dedupe_columns(table_name, columns)
+    job_id = dedupe_job(table_name, columns)
+    if job_id is not None:
+        return [], job_id, False
+    if '_row_hash' not in [col[0] for col in schema_catalog.columns(table_name)]:
+        raise DedupeNotIndexed(f'{table_name} is not indexed for finding duplicates yet')
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    if indexed_columns(cursor, table_name) != columns:
+        conn.close()
+        raise DedupeNotIndexed(f'{table_name} is not indexed on these columns yet')
+    pending = cursor.execute(f"SELECT COUNT(*) FROM {table_name} WHERE _row_hash IS NULL").fetchone()[0]
+    conn.close()
+    if pending > DEDUPE_INLINE_ROWS:
+        raise DedupeNotIndexed(f'{pending} rows changed since {table_name} was indexed')
+    if refresh_row_hashes(table_name, columns) is None:
+        raise DedupeNotIndexed(f'{table_name} was just indexed on other columns')
+    groups, truncated = find_duplicates(table_name, columns, near, threshold)
+    return groups, None, truncated
+
+JOB_HANDLERS = {
+    'reindex': run_reindex,
+    'vacuum': run_vacuum,
+    'analyze': run_analyze,
+    'export': run_export,
+    'import': run_import,
+    'dedupe_index': run_dedupe_index,
+}
+
+job_runner = JobRunner(DB_PATH, workers=JOB_WORKERS, max_queued=JOB_MAX_QUEUED)
+
+class HotTableMirror:
+    """Keeps copies of small tables in an in-memory SQLite database.
+
+    Listings run the same SQL against the copy, so search and sorting behave
+    exactly as on disk. Every commit the app makes is reported through
+    note_commit(), which only drops the copy of the table that was written.
+    PRAGMA data_version on a long-lived connection changes on any commit to the
+    file; when the app's own commits don't account for that, another process
+    wrote and every copy is reloaded before the next read.
+    """
+
+    def __init__(self, db_path, tables, max_rows=10000, recheck_seconds=5):
+        self.db_path = db_path
+        self.tables = set(tables)
+        self.max_rows = max_rows
+        self.recheck_seconds = recheck_seconds
+        self.lock = threading.Lock()
+        self.memory = None
+        self.watch = None
+        self.data_version = None
+        self.loaded = set()
+        self.app_commits = 0
+        self.seen_app_commits = 0
+        self.recheck_pending = False
+        self.last_full_reload = time.monotonic()
+        self.hits = 0
+        self.reloads = 0
+
+    def note_commit(self, table_name=None):
+        # Called after the app commits; table_name is the user table whose rows changed, if any
+        with self.lock:
+            self.app_commits += 1
+            if table_name is not None:
+                self.loaded.discard(table_name)
+
+    def is_hot(self, table_name):
+        return table_name in self.tables
+
+    def query(self, table_name, sql, params=()):
+        with self.lock:
+            if self.memory is None:
+                self.memory = sqlite3.connect(':memory:', check_same_thread=False)
+                self.watch = sqlite3.connect(self.db_path, check_same_thread=False)
+            data_version = self.watch.execute("PRAGMA data_version").fetchone()[0]
+            if data_version != self.data_version:
+                self.data_version = data_version
+                if self.app_commits == self.seen_app_commits:
+                    # Nobody in this process committed, so another program did
+                    self.recheck_pending = True
+                    self.last_full_reload = 0
+                else:
+                    # Most likely our own commits, already handled by note_commit(). An external
+                    # write could have landed alongside them, so look again in a little while.
+                    self.recheck_pending = True
+                self.seen_app_commits = self.app_commits
+            if self.recheck_pending and time.monotonic() - self.last_full_reload >= self.recheck_seconds:
+                self.loaded.clear()
+                self.recheck_pending = False
+                self.last_full_reload = time.monotonic()
+            if table_name not in self.loaded:
+                if not self._load(table_name):
+                    return None
+            self.hits += 1
+            return self.memory.execute(sql, params).fetchall()
+
+    def _load(self, table_name):
+        # Copies the table in one transaction, so readers see either the old or the new copy
+        conn = sqlite3.connect(self.db_path)
+        schema = conn.execute("SELECT sql FROM sqlite_master WHERE type='table' AND name = ?", (table_name,)).fetchone()
+        count = conn.execute(f"SELECT COUNT(*) FROM {table_name}").fetchone()[0] if schema else 0
+        if schema is None or count > self.max_rows:
+            # Gone or too big to be worth mirroring - serve it from disk from now on
+            conn.close()
+            self.tables.discard(table_name)
+            return False
+        cursor = conn.execute(f"SELECT * FROM {table_name}")
+        width = len(cursor.description)
+        rows = cursor.fetchall()
+        conn.close()
+        
+        try:
+            self.memory.execute("BEGIN")
+            self.memory.execute(f"DROP TABLE IF EXISTS {table_name}")
+            self.memory.execute(schema[0])
+            self.memory.executemany(f"INSERT INTO {table_name} VALUES ({', '.join(['?'] * width)})", rows)
+            self.memory.execute("COMMIT")
+        except sqlite3.Error:
+            # e.g. generated columns can't be copied with SELECT * - serve the table from disk instead
+            if self.memory.in_transaction:
+                self.memory.execute("ROLLBACK")
+            self.tables.discard(table_name)
+            return False
+        self.loaded.add(table_name)
+        self.reloads += 1
+        return True
+
+    def stats(self):
+        return {
+            'tables': sorted(self.tables),
+            'loaded': sorted(self.loaded),
+            'max_rows': self.max_rows,
+            'hits': self.hits,
+            'reloads': self.reloads,
+        }
+
+hot_tables = HotTableMirror(DB_PATH, HOT_TABLES, max_rows=HOT_TABLE_MAX_ROWS,
+                            recheck_seconds=HOT_TABLE_RECHECK_SECONDS)
+
+class TruncatedCell:
+    # Stands in for a long value in listings: a preview plus a link that loads the full value
+    def __init__(self, column, preview, length):
+        self.column = column
+        self.preview = preview
+        self.length = length
+
+    def __str__(self):
+        if isinstance(self.preview, bytes):
+            preview = ''
+            label = f'{self.length} bytes'
+        else:
+            preview = html_lib.escape(str(self.preview))
+            label = f'… ({self.length} chars)'
+        return (f'<span class="cell-preview">{preview}<a href="#" class="cell-more" '
+                f'data-action="expand" data-column="{html_lib.escape(self.column)}">{label}</a></span>')
+
+def format_cell(value):
+    # Every cell is shown as text, whether or not it was long enough to be truncated
+    if isinstance(value, TruncatedCell):
+        return str(value)
+    return html_lib.escape(str(value))
+
+def is_large_type(column_type):
+    # Anything without integer or real affinity can hold arbitrarily long text or blobs
+    column_type = column_type.upper()
+    return not any(t in column_type for t in ('INT', 'REAL', 'FLOA', 'DOUB', 'BOOL', 'DATE'))
+
+def get_table_data(table_name):
     # Get column names and types
     columns = get_column_info(table_name)
     column_names = [col[0] for col in columns]
@@ -42,8 +1148,19 @@ def get_table_data(table_name):
     # Handle search
     search_query = request.args.get('search', '').strip()
     
+    # Only select what the view shows, and just a prefix of long values
+    shown_columns = columns[:3] if view_type == 'compact' else columns
+    select_list = []
+    for name, column_type in shown_columns:
+        if is_large_type(column_type):
+            select_list.append(f"CASE WHEN length({name}) > {CELL_PREVIEW_LENGTH} "
+                               f"THEN substr({name}, 1, {CELL_PREVIEW_LENGTH}) ELSE {name} END")
+            select_list.append(f"length({name})")
+        else:
+            select_list.append(name)
+    
     # Build the query
-    query = f"SELECT * FROM {table_name}"
+    query = f"SELECT {', '.join(select_list)} FROM {table_name}"
     
     # Add search condition if search query exists
     if search_query:
@@ -56,15 +1173,31 @@ def get_table_data(table_name):
     if sort_column in column_names:
         query += f" ORDER BY {sort_column} {sort_direction.upper()}"
     
-    # Execute query
-    if search_query:
-        search_params = [f"%{search_query}%" for _ in column_names]
+    # Execute query, from the in-memory copy for hot tables
+    search_params = [f"%{search_query}%" for _ in column_names] if search_query else []
+    raw_rows = hot_tables.query(table_name, query, search_params) if hot_tables.is_hot(table_name) else None
+    if raw_rows is None:
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
         cursor.execute(query, search_params)
-    else:
-        cursor.execute(query)
+        raw_rows = cursor.fetchall()
+        conn.close()
     
-    rows = cursor.fetchall()
-    conn.close()
+    rows = []
+    for raw in raw_rows:
+        row = []
+        i = 0
+        for name, column_type in shown_columns:
+            value = raw[i]
+            if is_large_type(column_type):
+                length = raw[i + 1]
+                if length is not None and length > CELL_PREVIEW_LENGTH:
+                    value = TruncatedCell(name, value, length)
+                i += 2
+            else:
+                i += 1
+            row.append(value)
+        rows.append(row)
     
     # Create HTML table with controls
     html = '''
@@ -110,8 +1243,17 @@ def get_table_data(table_name):
     
     # Add "Add New Row" button
     html += f'<button onclick="showAddForm(\'{table_name}\')" class="btn btn-success mt-3">Add New Row</button>'
+    html += f' <a href="/dedupe/{table_name}" class="btn btn-outline-secondary mt-3">Find Duplicates</a>'
     return html
 
+# Per-row action buttons, identical for every row (see the delegated click handler in APP_JS)
+ROW_ACTIONS = ('<button data-action="edit" class="btn btn-sm btn-primary">Edit</button> '
+               '<button data-action="delete" class="btn btn-sm btn-danger">Delete</button>')
+LIST_ROW_ACTIONS = ('<button data-action="edit" class="btn btn-sm btn-primary mb-2">Edit</button> '
+                    '<button data-action="delete" class="btn btn-sm btn-danger">Delete</button>')
+COMPACT_ROW_ACTIONS = ('<button data-action="edit" class="btn btn-sm btn-primary btn-xs">Edit</button> '
+                       '<button data-action="delete" class="btn btn-sm btn-danger btn-xs">Delete</button>')
+
 def get_grid_view(rows, column_names, table_name, sort_column, sort_direction):
     html = '<table class="table table-striped table-bordered">'
     # Add header with sorting
@@ -134,48 +1276,23 @@ def get_grid_view(rows, column_names, table_name, sort_column, sort_direction):
         '''
     html += '<th>Actions</th></tr></thead>'
     
-    # Add rows
-    html += '<tbody>'
+    # Add rows - actions are handled by one delegated listener, so rows only carry their id
+    html += f'<tbody data-table="{table_name}">'
     for row in rows:
-        html += '<tr>'
+        html += f'<tr data-id="{row[0]}">'
         for value in row:
-            html += f'<td>{value}</td>'
-        row_id = row[0]
-        html += f'''
-            <td>
-                <button onclick="editRow('{table_name}', {row_id})" class="btn btn-sm btn-primary">Edit</button>
-                <button onclick="deleteRow('{table_name}', {row_id})" class="btn btn-sm btn-danger">Delete</button>
-            </td>
-        '''
-        html += '</tr>'
+            html += f'<td>{format_cell(value)}</td>'
+        html += f'<td>{ROW_ACTIONS}</td></tr>'
     html += '</tbody></table>'
     return html
 
 def get_list_view(rows, column_names, table_name):
-    html = '<div class="list-view">'
+    html = f'<div class="list-view" data-table="{table_name}">'
     for row in rows:
-        html += f'''
-        <div class="card mb-3">
-            <div class="card-body">
-                <div class="row">
-                    <div class="col-md-10">
-        '''
+        html += f'<div class="card mb-3" data-id="{row[0]}"><div class="card-body"><div class="row"><div class="col-md-10">'
         for i, value in enumerate(row):
-            html += f'''
-                <div class="mb-2">
-                    <strong>{column_names[i]}:</strong> {value}
-                </div>
-            '''
-        html += f'''
-                    </div>
-                    <div class="col-md-2 text-end">
-                        <button onclick="editRow('{table_name}', {row[0]})" class="btn btn-sm btn-primary mb-2">Edit</button>
-                        <button onclick="deleteRow('{table_name}', {row[0]})" class="btn btn-sm btn-danger">Delete</button>
-                    </div>
-                </div>
-            </div>
-        </div>
-        '''
+            html += f'<div class="mb-2"><strong>{column_names[i]}:</strong> {format_cell(value)}</div>'
+        html += f'</div><div class="col-md-2 text-end">{LIST_ROW_ACTIONS}</div></div></div></div>'
     html += '</div>'
     return html
 
@@ -188,95 +1305,690 @@ def get_compact_view(rows, column_names, table_name):
     html += '<th>Actions</th></tr></thead>'
     
     # Add rows
-    html += '<tbody>'
+    html += f'<tbody data-table="{table_name}">'
     for row in rows:
-        html += '<tr>'
+        html += f'<tr data-id="{row[0]}">'
         for value in row[:3]:  # Show only first 3 columns
-            html += f'<td>{value}</td>'
-        row_id = row[0]
-        html += f'''
-            <td>
-                <button onclick="editRow('{table_name}', {row_id})" class="btn btn-sm btn-primary btn-xs">Edit</button>
-                <button onclick="deleteRow('{table_name}', {row_id})" class="btn btn-sm btn-danger btn-xs">Delete</button>
-            </td>
-        '''
-        html += '</tr>'
+            html += f'<td>{format_cell(value)}</td>'
+        html += f'<td>{COMPACT_ROW_ACTIONS}</td></tr>'
     html += '</tbody></table>'
     return html
 
+@app.route('/cell/<table_name>/<int:row_id>/<column>')
+def get_cell(table_name, row_id, column):
+    if column not in [col[0] for col in get_column_info(table_name)]:
+        return 'Unknown column', 404
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    cursor.execute(f"SELECT {column} FROM {table_name} WHERE id = ?", (row_id,))
+    row = cursor.fetchone()
+    conn.close()
+    if row is None:
+        return 'Row not found', 404
+    value = row[0]
+    if isinstance(value, bytes):
+        value = value.decode('utf-8', 'replace')
+    return app.response_class('' if value is None else str(value), mimetype='text/plain')
+
 @app.route('/edit_row/<table_name>/<int:row_id>', methods=['GET'])
 def edit_row(table_name, row_id):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
     columns = get_column_info(table_name)
-    cursor.execute(f"SELECT * FROM {table_name} WHERE id = ?", (row_id,))
+    column_names = ", ".join([col[0] for col in columns])
+    # Tables the app hasn't written to yet have no _version column; their rows start at version 0
+    has_version = '_version' in [col[0] for col in schema_catalog.columns(table_name)]
+    cursor.execute(f"SELECT {column_names}, {'_version' if has_version else '0'} FROM {table_name} WHERE id = ?", (row_id,))
     row = cursor.fetchone()
     conn.close()
     
-    return render_template_string(EDIT_FORM_TEMPLATE,
+    return render_page(EDIT_FORM_TEMPLATE,
         table_name=table_name,
         row_id=row_id,
         columns=columns,
-        row=row
+        row=row[:-1] if row else row,
+        version=row[-1] if row else None
     )
 
+# Shown when a queued write outlives WRITE_QUEUE_TIMEOUT; it is still committed afterwards
+WRITE_PENDING_MESSAGE = "Your change is queued but not saved yet. It will be applied shortly, so don't submit it again."
+
 @app.route('/update_row/<table_name>/<int:row_id>', methods=['POST'])
 def update_row(table_name, row_id):
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     
+    ensure_versioning(table_name)
     columns = get_column_info(table_name)
-    update_values = []
-    for col in columns:
-        value = request.form.get(col[0], '')
-        update_values.append(value)
+    column_names = [col[0] for col in columns]
+    cursor.execute(f"SELECT {', '.join(column_names)}, _version FROM {table_name} WHERE id = ?", (row_id,))
+    current = cursor.fetchone()
+    conn.close()
+    if current is None:
+        return 'Row not found', 404
     
-    set_clause = ", ".join([f"{col[0]} = ?" for col in columns])
-    update_values.append(row_id)  # for WHERE clause
+    # Only write the columns the form actually changed
+    changed = {}
+    for i, col in enumerate(column_names):
+        if col in request.form and request.form[col] != str(current[i]):
+            changed[col] = request.form[col]
     
-    cursor.execute(f"UPDATE {table_name} SET {set_clause} WHERE id = ?", update_values)
-    conn.commit()
-    conn.close()
+    version = request.form.get('_version', type=int)
+    if version is not None and version != current[-1]:
+        return 'This row was changed by someone else, reload and try again', 409
+    if not changed:
+        return redirect(f'/?table={table_name}')
+    
+    try:
+        write = execute_write(build_write(table_name, 'update', changed, row_id, version), table_name=table_name)
+    except WriteQueueFull as e:
+        return str(e), 503
+    except TimeoutError:
+        return WRITE_PENDING_MESSAGE, 202
+    if write.rowcount == 0:
+        return 'This row was changed by someone else, reload and try again', 409
     
     return redirect(f'/?table={table_name}')
 
 @app.route('/delete_row/<table_name>/<int:row_id>', methods=['POST'])
 def delete_row(table_name, row_id):
-    conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-    cursor.execute(f"DELETE FROM {table_name} WHERE id = ?", (row_id,))
-    conn.commit()
-    conn.close()
+    try:
+        execute_write(build_write(table_name, 'delete', row_id=row_id), table_name=table_name)
+    except WriteQueueFull as e:
+        return str(e), 503
+    except TimeoutError:
+        return WRITE_PENDING_MESSAGE, 202
     return redirect(f'/?table={table_name}')
 
 @app.route('/add_row/<table_name>', methods=['GET', 'POST'])
 def add_row(table_name):
     if request.method == 'GET':
         columns = get_column_info(table_name)
-        return render_template_string(ADD_FORM_TEMPLATE,
+        return render_page(ADD_FORM_TEMPLATE,
             table_name=table_name,
             columns=columns
         )
     else:
-        conn = sqlite3.connect(DB_PATH)
-        cursor = conn.cursor()
-        
         columns = get_column_info(table_name)
-        insert_values = []
+        insert_values = {}
         for col in columns:
-            value = request.form.get(col[0], '')
-            insert_values.append(value)
-        
-        placeholders = ", ".join(["?" for _ in columns])
-        column_names = ", ".join([col[0] for col in columns])
+            if col[0] in request.form:
+                insert_values[col[0]] = request.form[col[0]]
         
-        cursor.execute(f"INSERT INTO {table_name} ({column_names}) VALUES ({placeholders})", insert_values)
-        conn.commit()
-        conn.close()
+        try:
+            execute_write(build_write(table_name, 'insert', insert_values), table_name=table_name)
+        except ValueError as e:
+            return str(e), 400
+        except WriteQueueFull as e:
+            return str(e), 503
+        except TimeoutError:
+            return WRITE_PENDING_MESSAGE, 202
         
         return redirect(f'/?table={table_name}')
 
+@app.route('/api/write/<table_name>', methods=['POST'])
+def api_write(table_name):
+    # Accepts one operation or a list of them:
+    # {"op": "insert" | "update" | "delete", "values": {...}, "id": 1, "version": 3}
+    # With "version", updates and deletes only apply if the row is still at that version.
+    # Pass ?wait=0 to return as soon as the writes are queued instead of committed
+    payload = request.get_json(silent=True)
+    if payload is None:
+        return jsonify({'error': 'Expected a JSON body'}), 400
+    operations = payload if isinstance(payload, list) else [payload]
+    if not all(isinstance(operation, dict) for operation in operations):
+        return jsonify({'error': 'Each operation must be a JSON object'}), 400
+    wait = request.args.get('wait', '1') != '0'
+    
+    # Build every write before submitting any, so one bad operation rejects the whole batch
+    try:
+        batch = [build_write(table_name, operation.get('op'), operation.get('values'),
+                             operation.get('id'), operation.get('version'))
+                 for operation in operations]
+    except ValueError as e:
+        return jsonify({'error': str(e), 'accepted': 0}), 400
+    
+    writes = []
+    try:
+        for statements in batch:
+            writes.append(execute_write(statements, wait=False, table_name=table_name))
+    except WriteQueueFull as e:
+        return jsonify({'error': str(e), 'accepted': len(writes)}), 503
+    
+    if not wait:
+        return jsonify({'queued': len(writes)}), 202
+    
+    results = []
+    for operation, write in zip(operations, writes):
+        try:
+            write.wait(WRITE_QUEUE_TIMEOUT)
+            row_id = write.lastrowid if operation.get('op') == 'insert' else operation.get('id')
+            if write.rowcount == 0:
+                error = 'Version conflict' if operation.get('version') is not None else 'Row not found'
+                results.append({'ok': False, 'id': row_id, 'error': error})
+            else:
+                results.append({'ok': True, 'id': row_id, 'rowcount': write.rowcount})
+        except TimeoutError:
+            # Still queued and will be committed, so the client must not retry it
+            results.append({'ok': False, 'pending': True, 'error': 'Write was not committed in time'})
+        except Exception as e:
+            results.append({'ok': False, 'error': str(e)})
+    return jsonify({'results': results})
+
+@app.route('/api/changes')
+def api_changes():
+    # Incremental sync: returns change log entries after ?since=<seq>, oldest first.
+    # Feed the returned "latest" back in as since on the next call.
+    since = request.args.get('since', 0, type=int)
+    limit = min(request.args.get('limit', 1000, type=int), 10000)
+    table_name = request.args.get('table')
+    
+    conn = sqlite3.connect(DB_PATH)
+    cursor = conn.cursor()
+    cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name = ?", (CHANGE_LOG_TABLE,))
+    if cursor.fetchone() is None:
+        conn.close()
+        return jsonify({'changes': [], 'latest': since, 'has_more': False})
+    
+    query = f"SELECT seq, table_name, row_id, op, version, changes, changed_at FROM {CHANGE_LOG_TABLE} WHERE seq > ?"
+    params = [since]
+    if table_name:
+        query += " AND table_name = ?"
+        params.append(table_name)
+    query += " ORDER BY seq LIMIT ?"
+    params.append(limit)
+    cursor.execute(query, params)
+    rows = cursor.fetchall()
+    conn.close()
+    
+    changes = [{
+        'seq': row[0],
+        'table': row[1],
+        'id': row[2],
+        'op': row[3],
+        'version': row[4],
+        'values': json.loads(row[5]) if row[5] else None,
+        'changed_at': row[6]
+    } for row in rows]
+    return jsonify({
+        'changes': changes,
+        'latest': rows[-1][0] if rows else since,
+        'has_more': len(rows) == limit
+    })
+
+@app.route('/jobs')
+def jobs_page():
+    return render_page(JOBS_TEMPLATE,
+        jobs=job_runner.list(),
+        tables=get_tables(),
+        kinds=list(JOB_HANDLERS),
+        asset_version=ASSET_VERSION
+    )
+
+@app.route('/api/jobs', methods=['GET', 'POST'])
+def api_jobs():
+    if request.method == 'GET':
+        return jsonify({'jobs': job_runner.list(limit=request.args.get('limit', 50, type=int))})
+    payload = request.get_json(silent=True) if request.is_json else request.form
+    if not hasattr(payload, 'get'):
+        return jsonify({'error': 'Expected a JSON object'}), 400
+    params = payload.get('params') or {}
+    if not isinstance(params, dict):
+        return jsonify({'error': 'params must be an object'}), 400
+    for key in ('kind', 'table', 'file'):
+        if payload.get(key) is not None and not isinstance(payload.get(key), str):
+            return jsonify({'error': f'{key} must be a string'}), 400
+    if payload.get('table'):
+        params = dict(params, table=payload.get('table'))
+    if payload.get('file'):
+        params = dict(params, file=payload.get('file'))
+    try:
+        job_id = job_runner.submit(payload.get('kind'), params)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    if not request.is_json:
+        return redirect('/jobs')
+    return jsonify({'id': job_id}), 202
+
+@app.route('/api/jobs/<int:job_id>')
+def api_job(job_id):
+    jobs = job_runner.list(job_id)
+    if not jobs:
+        return jsonify({'error': 'Job not found'}), 404
+    return jsonify(jobs[0])
+
+@app.route('/api/jobs/<int:job_id>/cancel', methods=['POST'])
+def api_cancel_job(job_id):
+    if not job_runner.cancel(job_id):
+        return jsonify({'error': 'Job is not queued or running'}), 409
+    return jsonify({'id': job_id, 'cancelling': True})
+
+@app.route('/exports/<path:filename>')
+def download_export(filename):
+    return send_from_directory(EXPORT_DIR, filename, as_attachment=True)
+
+@app.route('/dedupe/<table_name>')
+def dedupe_page(table_name):
+    columns = get_column_info(table_name)
+    selected = request.args.getlist('columns')
+    near = request.args.get('mode') == 'near'
+    threshold = request.args.get('threshold', NEAR_DUPLICATE_THRESHOLD, type=float)
+    groups, job_id, truncated, error, not_indexed, rows = [], None, False, None, None, {}
+    if selected:
+        try:
+            groups, job_id, truncated = prepare_duplicates(table_name, selected, near, threshold)
+        except DedupeNotIndexed as e:
+            not_indexed = str(e)
+        except ValueError as e:
+            error = str(e)
+        ids = [row_id for group in groups for row_id in group]
+        column_names = [col[0] for col in columns]
+        conn = sqlite3.connect(DB_PATH)
+        cursor = conn.cursor()
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            cursor.execute(f"SELECT {', '.join(column_names)} FROM {table_name} "
+                           f"WHERE id IN ({', '.join(['?'] * len(chunk))})", chunk)
+            for row in cursor.fetchall():
+                rows[row[column_names.index('id')]] = row
+        conn.close()
+    return render_page(DEDUPE_TEMPLATE,
+        table_name=table_name,
+        columns=columns,
+        selected=selected,
+        near=near,
+        threshold=threshold,
+        groups=groups,
+        rows=rows,
+        job_id=job_id,
+        truncated=truncated,
+        error=error,
+        not_indexed=not_indexed,
+        asset_version=ASSET_VERSION
+    )
+
+@app.route('/dedupe/<table_name>/index', methods=['POST'])
+def dedupe_index(table_name):
+    selected = request.form.getlist('columns')
+    try:
+        index_duplicates(table_name, selected)
+    except ValueError as e:
+        return str(e), 400
+    except JobQueueFull as e:
+        return str(e), 503
+    # Back to the search, which shows the results or the indexing job's progress
+    query = [('columns', col) for col in selected]
+    query += [(key, request.form[key]) for key in ('mode', 'threshold') if key in request.form]
+    return redirect(f'/dedupe/{table_name}?{urlencode(query)}')
+
+@app.route('/dedupe/<table_name>/resolve', methods=['POST'])
+def dedupe_resolve(table_name):
+    if request.is_json:
+        payload = request.get_json(silent=True)
+        if not isinstance(payload, dict):
+            return jsonify({'error': 'Expected a JSON object'}), 400
+        action = payload.get('action')
+        groups = payload.get('groups') or []
+    else:
+        action = request.form.get('action')
+        groups = [group.split(',') for group in request.form.getlist('group')]
+    if action not in ('delete', 'merge'):
+        return jsonify({'error': 'action must be delete or merge'}), 400
+    if not isinstance(groups, list) or not all(isinstance(group, list) for group in groups):
+        return jsonify({'error': 'groups must be a list of lists of row ids'}), 400
+    try:
+        # bool is an int subclass, but true/false are not row ids
+        if any(isinstance(i, bool) or not isinstance(i, (int, str)) for group in groups for i in group):
+            raise ValueError
+        groups = [sorted(int(i) for i in group) for group in groups]
+    except ValueError:
+        return jsonify({'error': 'groups must be a list of lists of row ids'}), 400
+    try:
+        removed = resolve_duplicates(table_name, groups, action)
+    except sqlite3.Error as e:
+        return jsonify({'error': str(e)}), 409
+    if request.is_json:
+        return jsonify({'removed': removed})
+    # Only ever send the browser back to this table's dedupe page
+    return_to = request.form.get('return_to') or ''
+    default = f'/dedupe/{table_name}'
+    if return_to != default and not return_to.startswith((default + '?', default + '/')):
+        return_to = default
+    return redirect(return_to)
+
+@app.route('/api/dedupe/<table_name>', methods=['GET', 'POST'])
+def api_dedupe(table_name):
+    # GET searches an existing index; POST first (re)indexes the table on the given columns
+    columns = request.args.getlist('columns')
+    try:
+        job_id = index_duplicates(table_name, columns) if request.method == 'POST' else None
+        if job_id is not None:
+            return jsonify({'indexing_job': job_id, 'groups': [], 'truncated': False}), 202
+        groups, job_id, truncated = prepare_duplicates(
+            table_name,
+            columns,
+            request.args.get('mode') == 'near',
+            request.args.get('threshold', NEAR_DUPLICATE_THRESHOLD, type=float)
+        )
+    except DedupeNotIndexed as e:
+        return jsonify({'error': f'{e}; POST to this URL to index it'}), 409
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except JobQueueFull as e:
+        return jsonify({'error': str(e)}), 503
+    if job_id is not None:
+        return jsonify({'indexing_job': job_id, 'groups': [], 'truncated': False}), 202
+    return jsonify({'groups': groups, 'truncated': truncated})
+
+@app.route('/api/hot_tables')
+def api_hot_tables():
+    return jsonify(hot_tables.stats())
+
+@app.route('/api/write_queue')
+def api_write_queue():
+    return jsonify(dict(write_queue.stats(), enabled=WRITE_QUEUE_ENABLED))
+
+APP_CSS = '''
+body { 
+    padding: 20px;
+    font-family: 'Inter', sans-serif;
+    background-color: #1a2634;
+    min-height: 100vh;
+    position: relative;
+    overflow-x: hidden;
+}
+.snowflake {
+    position: fixed;
+    top: -10px;
+    animation: fall linear forwards;
+}
+@keyframes fall {
+    to {
+        transform: translateY(100vh);
+    }
+}
+.container {
+    max-width: 1200px;
+    margin: 0 auto;
+    background-color: rgba(255, 255, 255, 0.95);
+    padding: 2rem;
+    border-radius: 12px;
+    box-shadow: 0 4px 24px rgba(0, 0, 0, 0.2);
+    position: relative;
+    z-index: 1;
+    backdrop-filter: blur(8px);
+}
+.table-container { 
+    margin-top: 20px; 
+    overflow-x: auto;
+    border-radius: 8px;
+    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05);
+}
+.nav-pills { 
+    margin-bottom: 20px;
+    gap: 0.5rem;
+}
+.nav-pills .nav-link {
+    border-radius: 6px;
+    padding: 0.5rem 1rem;
+    color: #495057;
+    font-weight: 500;
+    transition: all 0.2s;
+}
+.nav-pills .nav-link:hover {
+    background-color: #e9ecef;
+}
+.nav-pills .nav-link.active {
+    background-color: #dc3545;
+    color: white;
+}
+.table {
+    margin-bottom: 0;
+}
+.table thead th {
+    background-color: #f8f9fa;
+    border-bottom: 2px solid #dee2e6;
+    padding: 1rem;
+    font-weight: 600;
+    color: #495057;
+}
+.table td {
+    padding: 1rem;
+    vertical-align: middle;
+}
+.btn {
+    font-weight: 500;
+    padding: 0.5rem 1rem;
+    border-radius: 6px;
+    transition: all 0.2s;
+}
+.btn:hover {
+    transform: translateY(-1px);
+}
+.btn-sm {
+    padding: 0.25rem 0.75rem;
+}
+.btn-primary {
+    background-color: #2F5373;
+    border: none;
+    margin-right: 0.5rem;
+}
+.btn-danger {
+    background-color: #dc3545;
+    border: none;
+}
+.btn-success {
+    background-color: #198754;
+    border: none;
+}
+h1 {
+    color: #dc3545;
+    font-family: 'Mountains of Christmas', cursive;
+    font-weight: 700;
+    font-size: 2.5rem;
+    margin-bottom: 1.5rem;
+    text-align: center;
+    text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.1);
+}
+h2 {
+    color: #495057;
+    font-weight: 500;
+    font-size: 1.25rem;
+    margin-bottom: 1rem;
+}
+.festive-border {
+    border: 2px solid #dc3545;
+    border-radius: 12px;
+    padding: 1rem;
+    margin-bottom: 1rem;
+}
+.btn-link {
+    color: #495057;
+    text-decoration: none;
+    font-weight: 600;
+}
+.btn-link:hover {
+    color: #dc3545;
+}
+.table-controls {
+    background: rgba(255, 255, 255, 0.8);
+    padding: 1rem;
+    border-radius: 8px;
+    backdrop-filter: blur(8px);
+}
+.table thead th {
+    position: relative;
+    cursor: pointer;
+}
+.table thead th:hover .btn-link {
+    color: #dc3545;
+}
+.view-controls .view-toggle {
+    background: rgba(255, 255, 255, 0.9);
+    padding: 0.25rem;
+    border-radius: 8px;
+    backdrop-filter: blur(8px);
+    display: inline-flex;
+    gap: 0;
+}
+.view-toggle .btn {
+    border: 1px solid #dee2e6;
+    padding: 0.5rem 1rem;
+    display: inline-flex;
+    align-items: center;
+    justify-content: center;
+    min-width: 100px;
+}
+.view-toggle .btn:not(:last-child) {
+    border-right: none;
+}
+.view-toggle .btn.active {
+    background-color: #dc3545;
+    border-color: #dc3545;
+    color: white;
+    position: relative;
+    z-index: 1;
+}
+.view-toggle .btn:hover:not(.active) {
+    background-color: #f8f9fa;
+    border-color: #dee2e6;
+    z-index: 2;
+}
+.view-toggle .btn i {
+    font-size: 1.1rem;
+}
+.list-view .card {
+    transition: all 0.2s;
+    border: none;
+    box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05);
+}
+.list-view .card:hover {
+    transform: translateY(-2px);
+    box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
+}
+.btn-xs {
+    padding: 0.1rem 0.4rem;
+    font-size: 0.75rem;
+}
+.compact-view td {
+    padding: 0.5rem;
+}
+.cell-preview {
+    white-space: pre-wrap;
+}
+.cell-more {
+    margin-left: 0.25rem;
+    white-space: nowrap;
+}
+'''
+
+APP_JS = '''
+function createSnowflake() {
+    const snowflake = document.createElement('div');
+    snowflake.classList.add('snowflake');
+    snowflake.style.left = Math.random() * 100 + 'vw';
+    snowflake.style.opacity = Math.random();
+    snowflake.style.animation = `fall ${Math.random() * 3 + 2}s linear forwards`;
+    snowflake.innerHTML = '❄';
+    snowflake.style.color = 'white';
+    snowflake.style.fontSize = (Math.random() * 10 + 10) + 'px';
+    document.body.appendChild(snowflake);
+
+    snowflake.addEventListener('animationend', () => {
+        snowflake.remove();
+    });
+}
+
+function startSnow() {
+    setInterval(createSnowflake, 100);
+}
+
+function editRow(tableName, rowId) {
+    window.location.href = `/edit_row/${tableName}/${rowId}`;
+}
+
+function deleteRow(tableName, rowId) {
+    if (confirm('Are you sure you want to delete this row?')) {
+        fetch(`/delete_row/${tableName}/${rowId}`, {
+            method: 'POST'
+        }).then(() => window.location.reload());
+    }
+}
+
+function showAddForm(tableName) {
+    window.location.href = `/add_row/${tableName}`;
+}
+
+function cancelJob(jobId) {
+    fetch(`/api/jobs/${jobId}/cancel`, {
+        method: 'POST'
+    }).then(() => window.location.reload());
+}
+
+function expandCell(link, tableName, rowId) {
+    const preview = link.closest('.cell-preview');
+    fetch(`/cell/${tableName}/${rowId}/${encodeURIComponent(link.dataset.column)}`)
+        .then(response => response.text())
+        .then(text => { preview.textContent = text; });
+}
+
+// One listener handles the Edit/Delete buttons and "show more" links of every row
+document.addEventListener('click', function(event) {
+    const button = event.target.closest('[data-action]');
+    if (!button) return;
+    const tableName = button.closest('[data-table]').dataset.table;
+    const rowId = button.closest('[data-id]').dataset.id;
+    if (button.dataset.action === 'expand') {
+        event.preventDefault();
+        expandCell(button, tableName, rowId);
+    } else if (button.dataset.action === 'edit') {
+        editRow(tableName, rowId);
+    } else if (button.dataset.action === 'delete') {
+        deleteRow(tableName, rowId);
+    }
+});
+
+window.onload = function() {
+    startSnow();
+}
+
+let searchTimeout;
+function debounceSearch(value) {
+    clearTimeout(searchTimeout);
+    searchTimeout = setTimeout(() => {
+        const urlParams = new URLSearchParams(window.location.search);
+        urlParams.set('search', value);
+        window.location.search = urlParams.toString();
+    }, 500);
+}
+
+function sortTable(column) {
+    const urlParams = new URLSearchParams(window.location.search);
+    const currentSort = urlParams.get('sort');
+    const currentDirection = urlParams.get('direction');
+
+    if (currentSort === column) {
+        urlParams.set('direction', currentDirection === 'asc' ? 'desc' : 'asc');
+    } else {
+        urlParams.set('sort', column);
+        urlParams.set('direction', 'asc');
+    }
+
+    window.location.search = urlParams.toString();
+}
+
+function changeView(viewType) {
+    const urlParams = new URLSearchParams(window.location.search);
+    urlParams.set('view', viewType);
+    window.location.search = urlParams.toString();
+}
+'''
+
+ASSET_VERSION = hashlib.md5((APP_CSS + APP_JS).encode()).hexdigest()[:8]
+
 HTML_TEMPLATE = '''
 <!DOCTYPE html>
 <html>
@@ -285,269 +1997,14 @@ HTML_TEMPLATE = '''
     <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
     <link href="https://cdn.jsdelivr.net/npm/bootstrap-icons@1.7.2/font/bootstrap-icons.css" rel="stylesheet">
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&family=Mountains+of+Christmas:wght@700&display=swap" rel="stylesheet">
-    <style>
-        body { 
-            padding: 20px;
-            font-family: 'Inter', sans-serif;
-            background-color: #1a2634;
-            min-height: 100vh;
-            position: relative;
-            overflow-x: hidden;
-        }
-        .snowflake {
-            position: fixed;
-            top: -10px;
-            animation: fall linear forwards;
-        }
-        @keyframes fall {
-            to {
-                transform: translateY(100vh);
-            }
-        }
-        .container {
-            max-width: 1200px;
-            margin: 0 auto;
-            background-color: rgba(255, 255, 255, 0.95);
-            padding: 2rem;
-            border-radius: 12px;
-            box-shadow: 0 4px 24px rgba(0, 0, 0, 0.2);
-            position: relative;
-            z-index: 1;
-            backdrop-filter: blur(8px);
-        }
-        .table-container { 
-            margin-top: 20px; 
-            overflow-x: auto;
-            border-radius: 8px;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05);
-        }
-        .nav-pills { 
-            margin-bottom: 20px;
-            gap: 0.5rem;
-        }
-        .nav-pills .nav-link {
-            border-radius: 6px;
-            padding: 0.5rem 1rem;
-            color: #495057;
-            font-weight: 500;
-            transition: all 0.2s;
-        }
-        .nav-pills .nav-link:hover {
-            background-color: #e9ecef;
-        }
-        .nav-pills .nav-link.active {
-            background-color: #dc3545;
-            color: white;
-        }
-        .table {
-            margin-bottom: 0;
-        }
-        .table thead th {
-            background-color: #f8f9fa;
-            border-bottom: 2px solid #dee2e6;
-            padding: 1rem;
-            font-weight: 600;
-            color: #495057;
-        }
-        .table td {
-            padding: 1rem;
-            vertical-align: middle;
-        }
-        .btn {
-            font-weight: 500;
-            padding: 0.5rem 1rem;
-            border-radius: 6px;
-            transition: all 0.2s;
-        }
-        .btn:hover {
-            transform: translateY(-1px);
-        }
-        .btn-sm {
-            padding: 0.25rem 0.75rem;
-        }
-        .btn-primary {
-            background-color: #2F5373;
-            border: none;
-            margin-right: 0.5rem;
-        }
-        .btn-danger {
-            background-color: #dc3545;
-            border: none;
-        }
-        .btn-success {
-            background-color: #198754;
-            border: none;
-        }
-        h1 {
-            color: #dc3545;
-            font-family: 'Mountains of Christmas', cursive;
-            font-weight: 700;
-            font-size: 2.5rem;
-            margin-bottom: 1.5rem;
-            text-align: center;
-            text-shadow: 2px 2px 4px rgba(0, 0, 0, 0.1);
-        }
-        h2 {
-            color: #495057;
-            font-weight: 500;
-            font-size: 1.25rem;
-            margin-bottom: 1rem;
-        }
-        .festive-border {
-            border: 2px solid #dc3545;
-            border-radius: 12px;
-            padding: 1rem;
-            margin-bottom: 1rem;
-        }
-        .btn-link {
-            color: #495057;
-            text-decoration: none;
-            font-weight: 600;
-        }
-        .btn-link:hover {
-            color: #dc3545;
-        }
-        .table-controls {
-            background: rgba(255, 255, 255, 0.8);
-            padding: 1rem;
-            border-radius: 8px;
-            backdrop-filter: blur(8px);
-        }
-        .table thead th {
-            position: relative;
-            cursor: pointer;
-        }
-        .table thead th:hover .btn-link {
-            color: #dc3545;
-        }
-        .view-controls .view-toggle {
-            background: rgba(255, 255, 255, 0.9);
-            padding: 0.25rem;
-            border-radius: 8px;
-            backdrop-filter: blur(8px);
-            display: inline-flex;
-            gap: 0;
-        }
-        .view-toggle .btn {
-            border: 1px solid #dee2e6;
-            padding: 0.5rem 1rem;
-            display: inline-flex;
-            align-items: center;
-            justify-content: center;
-            min-width: 100px;
-        }
-        .view-toggle .btn:not(:last-child) {
-            border-right: none;
-        }
-        .view-toggle .btn.active {
-            background-color: #dc3545;
-            border-color: #dc3545;
-            color: white;
-            position: relative;
-            z-index: 1;
-        }
-        .view-toggle .btn:hover:not(.active) {
-            background-color: #f8f9fa;
-            border-color: #dee2e6;
-            z-index: 2;
-        }
-        .view-toggle .btn i {
-            font-size: 1.1rem;
-        }
-        .list-view .card {
-            transition: all 0.2s;
-            border: none;
-            box-shadow: 0 2px 8px rgba(0, 0, 0, 0.05);
-        }
-        .list-view .card:hover {
-            transform: translateY(-2px);
-            box-shadow: 0 4px 12px rgba(0, 0, 0, 0.1);
-        }
-        .btn-xs {
-            padding: 0.1rem 0.4rem;
-            font-size: 0.75rem;
-        }
-        .compact-view td {
-            padding: 0.5rem;
-        }
-    </style>
-    <script>
-        function createSnowflake() {
-            const snowflake = document.createElement('div');
-            snowflake.classList.add('snowflake');
-            snowflake.style.left = Math.random() * 100 + 'vw';
-            snowflake.style.opacity = Math.random();
-            snowflake.style.animation = `fall ${Math.random() * 3 + 2}s linear forwards`;
-            snowflake.innerHTML = '❄';
-            snowflake.style.color = 'white';
-            snowflake.style.fontSize = (Math.random() * 10 + 10) + 'px';
-            document.body.appendChild(snowflake);
-
-            snowflake.addEventListener('animationend', () => {
-                snowflake.remove();
-            });
-        }
-
-        function startSnow() {
-            setInterval(createSnowflake, 100);
-        }
-
-        function editRow(tableName, rowId) {
-            window.location.href = `/edit_row/${tableName}/${rowId}`;
-        }
-        
-        function deleteRow(tableName, rowId) {
-            if (confirm('Are you sure you want to delete this row?')) {
-                fetch(`/delete_row/${tableName}/${rowId}`, {
-                    method: 'POST'
-                }).then(() => window.location.reload());
-            }
-        }
-        
-        function showAddForm(tableName) {
-            window.location.href = `/add_row/${tableName}`;
-        }
-
-        window.onload = function() {
-            startSnow();
-        }
-
-        let searchTimeout;
-        function debounceSearch(value) {
-            clearTimeout(searchTimeout);
-            searchTimeout = setTimeout(() => {
-                const urlParams = new URLSearchParams(window.location.search);
-                urlParams.set('search', value);
-                window.location.search = urlParams.toString();
-            }, 500);
-        }
-        
-        function sortTable(column) {
-            const urlParams = new URLSearchParams(window.location.search);
-            const currentSort = urlParams.get('sort');
-            const currentDirection = urlParams.get('direction');
-            
-            if (currentSort === column) {
-                urlParams.set('direction', currentDirection === 'asc' ? 'desc' : 'asc');
-            } else {
-                urlParams.set('sort', column);
-                urlParams.set('direction', 'asc');
-            }
-            
-            window.location.search = urlParams.toString();
-        }
-
-        function changeView(viewType) {
-            const urlParams = new URLSearchParams(window.location.search);
-            urlParams.set('view', viewType);
-            window.location.search = urlParams.toString();
-        }
-    </script>
+    <link href="/assets/app.css?v={{ asset_version }}" rel="stylesheet">
+    <script src="/assets/app.js?v={{ asset_version }}"></script>
 </head>
 <body>
     <div class="container">
         <h1>❄️ JackTable ❄️</h1>
         <div class="festive-border">
+            <a href="/jobs" class="btn btn-sm btn-link float-end">Jobs</a>
             <ul class="nav nav-pills">
                 {% for table in tables %}
                 <li class="nav-item">
@@ -674,6 +2131,7 @@ EDIT_FORM_TEMPLATE = '''
     <div class="container">
         <h2>Edit Row in {{ table_name }} ❄️</h2>
         <form action="/update_row/{{ table_name }}/{{ row_id }}" method="post">
+            {% if version is not none %}<input type="hidden" name="_version" value="{{ version }}">{% endif %}
             {% for i in range(columns|length) %}
             <div class="mb-3">
                 <label class="form-label">{{ columns[i][0] }}</label>
@@ -813,17 +2271,323 @@ ADD_FORM_TEMPLATE = '''
 </html>
 '''
 
+JOBS_TEMPLATE = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <title>JackTable - Jobs</title>
+    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&family=Mountains+of+Christmas:wght@700&display=swap" rel="stylesheet">
+    <link href="/assets/app.css?v={{ asset_version }}" rel="stylesheet">
+    <script src="/assets/app.js?v={{ asset_version }}"></script>
+    {% if jobs|selectattr('status', 'in', ['queued', 'running'])|list %}
+    <meta http-equiv="refresh" content="2">
+    {% endif %}
+</head>
+<body>
+    <div class="container">
+        <h1>❄️ JackTable Jobs ❄️</h1>
+        <div class="festive-border">
+            <form action="/api/jobs" method="post" class="row g-2 align-items-center">
+                <div class="col-md-3">
+                    <select name="kind" class="form-select">
+                        {% for kind in kinds %}<option value="{{ kind }}">{{ kind }}</option>{% endfor %}
+                    </select>
+                </div>
+                <div class="col-md-3">
+                    <select name="table" class="form-select">
+                        <option value="">All tables</option>
+                        {% for table in tables %}<option value="{{ table }}">{{ table }}</option>{% endfor %}
+                    </select>
+                </div>
+                <div class="col-md-4">
+                    <input type="text" name="file" class="form-control" placeholder="CSV file in db/imports (import only)">
+                </div>
+                <div class="col-md-2">
+                    <button type="submit" class="btn btn-success w-100">Start</button>
+                </div>
+            </form>
+        </div>
+        <table class="table table-bordered">
+            <thead><tr><th>#</th><th>Job</th><th>Status</th><th>Progress</th><th>Details</th><th></th></tr></thead>
+            <tbody>
+            {% for job in jobs %}
+            <tr>
+                <td>{{ job.id }}</td>
+                <td>{{ job.kind }} {{ job.params.get('table', '') }}</td>
+                <td>{{ job.status }}</td>
+                <td>
+                    <div class="progress"><div class="progress-bar" style="width: {{ (job.progress * 100)|round|int }}%"></div></div>
+                </td>
+                <td>
+                    {{ job.message or '' }}
+                    {% if job.result and job.result.file %}<a href="/exports/{{ job.result.file }}">{{ job.result.file }}</a>{% endif %}
+                </td>
+                <td>
+                    {% if job.status in ['queued', 'running'] %}
+                    <button onclick="cancelJob({{ job.id }})" class="btn btn-sm btn-danger">Cancel</button>
+                    {% endif %}
+                </td>
+            </tr>
+            {% endfor %}
+            </tbody>
+        </table>
+        <a href="/" class="btn btn-secondary">Back to tables</a>
+    </div>
+</body>
+</html>
+'''
+
+DEDUPE_TEMPLATE = '''
+<!DOCTYPE html>
+<html>
+<head>
+    <title>JackTable - Duplicates in {{ table_name }}</title>
+    <link href="https://cdn.jsdelivr.net/npm/bootstrap@5.1.3/dist/css/bootstrap.min.css" rel="stylesheet">
+    <link href="https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600&family=Mountains+of+Christmas:wght@700&display=swap" rel="stylesheet">
+    <link href="/assets/app.css?v={{ asset_version }}" rel="stylesheet">
+    <script src="/assets/app.js?v={{ asset_version }}"></script>
+</head>
+<body>
+    <div class="container">
+        <h1>❄️ Duplicates in {{ table_name }} ❄️</h1>
+        <div class="festive-border">
+            <form method="get" class="row g-2 align-items-center">
+                <div class="col-md-6">
+                    {% for column in columns %}
+                    <label class="me-3">
+                        <input type="checkbox" name="columns" value="{{ column[0] }}" {% if column[0] in selected %}checked{% endif %}>
+                        {{ column[0] }}
+                    </label>
+                    {% endfor %}
+                </div>
+                <div class="col-md-2">
+                    <select name="mode" class="form-select">
+                        <option value="exact">Exact</option>
+                        <option value="near" {% if near %}selected{% endif %}>Near (text)</option>
+                    </select>
+                </div>
+                <div class="col-md-2">
+                    <input type="number" name="threshold" class="form-control" min="0" max="1" step="0.05" value="{{ threshold }}">
+                </div>
+                <div class="col-md-2">
+                    <button type="submit" class="btn btn-success w-100">Find</button>
+                </div>
+            </form>
+        </div>
+        {% if error %}
+        <div class="alert alert-danger">{{ error }}</div>
+        {% elif not_indexed %}
+        <form action="/dedupe/{{ table_name }}/index" method="post" class="alert alert-info">
+            {% for column in selected %}<input type="hidden" name="columns" value="{{ column }}">{% endfor %}
+            <input type="hidden" name="mode" value="{{ 'near' if near else 'exact' }}">
+            <input type="hidden" name="threshold" value="{{ threshold }}">
+            {{ not_indexed }}. Indexing adds a hidden <code>_row_hash</code> column to the table and hashes every row.
+            <button type="submit" class="btn btn-sm btn-primary ms-2">Index and search</button>
+        </form>
+        {% elif job_id %}
+        <div class="alert alert-info">
+            Hashing rows in the background - <a href="/jobs">follow job #{{ job_id }}</a> and search again when it's done.
+        </div>
+        {% elif selected %}
+        <form action="/dedupe/{{ table_name }}/resolve" method="post">
+            <input type="hidden" name="return_to" value="{{ request.full_path }}">
+            <p>{{ groups|length }} group{{ '' if groups|length == 1 else 's' }} found. The first row of each group is kept.</p>
+            {% if truncated %}
+            <div class="alert alert-warning">
+                The search stopped early, so this list is incomplete. Resolve these groups, or pick more specific columns, and search again.
+            </div>
+            {% endif %}
+            {% for group in groups %}
+            <div class="card mb-3">
+                <div class="card-body">
+                    <label class="mb-2">
+                        <input type="checkbox" name="group" value="{{ group|join(',') }}" checked> Group {{ loop.index }}
+                    </label>
+                    <table class="table table-sm table-bordered mb-0">
+                        <thead><tr>{% for column in columns %}<th>{{ column[0] }}</th>{% endfor %}</tr></thead>
+                        <tbody>
+                        {% for row_id in group %}
+                        <tr {% if loop.first %}class="table-success"{% endif %}>
+                            {% for value in rows.get(row_id, []) %}<td>{{ value|string|truncate(80) }}</td>{% endfor %}
+                        </tr>
+                        {% endfor %}
+                        </tbody>
+                    </table>
+                </div>
+            </div>
+            {% endfor %}
+            {% if groups %}
+            <button type="submit" name="action" value="merge" class="btn btn-primary">Merge into first row</button>
+            <button type="submit" name="action" value="delete" class="btn btn-danger"
+                    onclick="return confirm('Delete the duplicate rows of the selected groups?')">Delete duplicates</button>
+            {% endif %}
+        </form>
+        {% endif %}
+        <a href="/?table={{ table_name }}" class="btn btn-secondary mt-3">Back to {{ table_name }}</a>
+    </div>
+</body>
+</html>
+'''
+
+brotli = None
+
+def load_brotli():
+    # Imported on first use; returns None when the optional brotli package isn't installed
+    global brotli
+    if brotli is None:
+        try:
+            import brotli as module
+        except ImportError:
+            module = False
+        brotli = module
+    return brotli or None
+
+compiled_templates = {}
+
+def render_page(source, **context):
+    # Like render_template_string, but each template is compiled once instead of on every request
+    template = compiled_templates.get(source)
+    if template is None:
+        template = compiled_templates[source] = app.jinja_env.from_string(source)
+    app.update_template_context(context)
+    return template.render(context)
+
+def warm_up():
+    # Compiles templates and loads the schema ahead of the first request
+    for source in (HTML_TEMPLATE, EDIT_FORM_TEMPLATE, ADD_FORM_TEMPLATE, JOBS_TEMPLATE, DEDUPE_TEMPLATE):
+        if source not in compiled_templates:
+            compiled_templates[source] = app.jinja_env.from_string(source)
+    for table_name in get_tables():
+        get_column_info(table_name)
+    load_brotli()
+
+def start_after_bind(host, port, timeout=30):
+    # Waits until the server accepts connections, then warms up and starts the job runner,
+    # so none of this competes with getting the port open
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection((host, port), timeout=0.5).close()
+            break
+        except OSError:
+            time.sleep(0.02)
+    warm_up()
+    job_runner.start()
+
+def print_startup_profile():
+    import subprocess
+    
+    # Import cost of every module, measured in a fresh interpreter
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', 'import app'],
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+        capture_output=True,
+        text=True
+    )
+    imports = []
+    for line in result.stderr.splitlines():
+        parts = line.split('|')
+        if len(parts) == 3 and parts[1].strip().isdigit():
+            imports.append((int(parts[1]), int(parts[0].split(':')[1]), parts[2].rstrip()))
+    print('Slowest imports (cumulative ms / self ms / module):')
+    for cumulative, self_us, name in sorted(imports, reverse=True)[:15]:
+        print(f'  {cumulative / 1000:8.1f} {self_us / 1000:8.1f}  {name}')
+    
+    import_ms = (IMPORT_FINISHED - STARTUP_STARTED) * 1000
+    client = app.test_client()
+    started = time.perf_counter()
+    client.get('/')
+    first_ms = (time.perf_counter() - started) * 1000
+    started = time.perf_counter()
+    client.get('/')
+    second_ms = (time.perf_counter() - started) * 1000
+    
+    total_ms = import_ms + first_ms
+    print()
+    print(f'Module import:        {import_ms:8.1f} ms')
+    print(f'First request:        {first_ms:8.1f} ms')
+    print(f'Second request:       {second_ms:8.1f} ms')
+    print(f'Time to first page:   {total_ms:8.1f} ms (budget {STARTUP_BUDGET_MS} ms, '
+          f'{"OK" if total_ms <= STARTUP_BUDGET_MS else "OVER"})')
+
+def compress_stream(chunks, encoding, charset='utf-8'):
+    # Compresses a streamed body chunk by chunk, flushing so the browser can render as it arrives
+    if encoding == 'br':
+        compressor = brotli.Compressor(quality=min(COMPRESS_LEVEL, 11))
+        compress, flush, finish = compressor.process, compressor.flush, compressor.finish
+    else:
+        compressor = zlib.compressobj(COMPRESS_LEVEL, zlib.DEFLATED, 31)  # 31 = gzip container
+        compress, flush, finish = compressor.compress, lambda: compressor.flush(zlib.Z_SYNC_FLUSH), compressor.flush
+    for chunk in chunks:
+        if isinstance(chunk, str):
+            chunk = chunk.encode(charset)
+        data = compress(chunk) + flush()
+        if data:
+            yield data
+    yield finish()
+
+@app.after_request
+def compress_response(response):
+    if (response.direct_passthrough
+            or response.status_code < 200 or response.status_code in (204, 304)
+            or 'Content-Encoding' in response.headers
+            or response.mimetype not in COMPRESS_MIMETYPES):
+        return response
+    response.vary.add('Accept-Encoding')
+    encoding = request.accept_encodings.best_match(['br', 'gzip'] if load_brotli() else ['gzip'])
+    if not encoding:
+        return response
+    
+    if response.is_streamed:
+        response.response = compress_stream(response.response, encoding)
+        response.headers.pop('Content-Length', None)
+    else:
+        data = response.get_data()
+        if len(data) < COMPRESS_MIN_SIZE:
+            return response
+        if encoding == 'br':
+            response.set_data(brotli.compress(data, quality=min(COMPRESS_LEVEL, 11)))
+        else:
+            response.set_data(zlib.compress(data, COMPRESS_LEVEL, wbits=31))
+    response.headers['Content-Encoding'] = encoding
+    return response
+
+@app.route('/assets/<name>')
+def asset(name):
+    assets = {
+        'app.css': (APP_CSS, 'text/css'),
+        'app.js': (APP_JS, 'application/javascript'),
+    }
+    if name not in assets:
+        return 'Not found', 404
+    body, mimetype = assets[name]
+    response = app.response_class(body, mimetype=mimetype)
+    # URLs carry the content hash, so a versioned asset never changes
+    response.cache_control.public = True
+    response.cache_control.max_age = 31536000 if request.args.get('v') == ASSET_VERSION else 300
+    return response
+
 @app.route('/')
 def index():
     tables = get_tables()
     current_table = request.args.get('table', tables[0] if tables else None)
     table_html = get_table_data(current_table) if current_table else ''
-    return render_template_string(
+    return render_page(
         HTML_TEMPLATE,
         tables=tables,
         current_table=current_table,
-        table_html=table_html
+        table_html=table_html,
+        asset_version=ASSET_VERSION
     )
 
+IMPORT_FINISHED = time.perf_counter()
+
 if __name__ == '__main__':
-    app.run(debug=True, port=5000) 
\ No newline at end of file
+    if '--profile-startup' in sys.argv:
+        print_startup_profile()
+        sys.exit(0)
+    # With the debug reloader only the child process serves requests, so start background work there
+    if not DEBUG or os.environ.get('WERKZEUG_RUN_MAIN') == 'true':
+        threading.Thread(target=start_after_bind, args=('127.0.0.1', 5000), name='jacktable-warm-up', daemon=True).start()
+    app.run(debug=DEBUG, port=5000) 
\ No newline at end of file